@@ -3,3 +3,5 @@ All elements allowing to interact with the ADE API
 """
 from .adeclient import ADEClient
 from .elements import Instructor, Unite, Category, Classroom, Event
+from .conflicts import Conflict, find_conflicts, resource_conflicts
+from .table import EventTable
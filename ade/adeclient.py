@@ -10,12 +10,37 @@ The features of the ADE Web API implemented here are the following:
     getResources
 """
 
+import logging
 # noinspection PyPep8Naming
 import xml.etree.ElementTree as ET
-from typing import Optional, Union
+from typing import Optional, Union, Iterable
 
 import requests
 
+from snapshot import Snapshot
+from .elements import Category
+
+logger = logging.getLogger(__name__)
+
+# degree of details providing every attribute of the resources
+FULL_DETAIL = 11
+
+# attributes of the resources required to build them and to store them in the database, ``isGroup`` allows to leave
+# out the groups
+RESOURCES_ATTRIBUTES = {
+    Category.CLASSROOM: ("isGroup", "fatherName"),
+    Category.INSTRUCTOR: ("isGroup", "path", "code"),
+    Category.UNITE: ("isGroup", "fatherName", "code"),
+}
+
+# degree of details at which each category is requested, it should provide the ``RESOURCES_ATTRIBUTES`` of the
+# category, which is checked on each response: the category is requested again at ``FULL_DETAIL`` otherwise
+RESOURCES_DETAIL = {
+    Category.CLASSROOM: 3,
+    Category.INSTRUCTOR: 4,
+    Category.UNITE: 4,
+}
+
 
 class ADEClient:
     """
@@ -28,21 +53,27 @@ class ADEClient:
     sessionId: Optional[str] = None
     projectId: Optional[str] = None
 
-    def __init__(self, url, login, password=""):
+    snapshot: Optional[Snapshot] = None
+    payload_sizes: dict[str, int]
+
+    def __init__(self, url, login, password="", snapshot: Optional[Snapshot] = None):
         """
         Create a new ADE Web API client
 
         :param url: url of the ADE Web API
         :param login: login of the used ADE account
         :param password: password of the used ADE account
+        :param snapshot: snapshot in which the responses are archived, or from which they are replayed
         :raise ValueError: if values supplied are not correct
         """
-        if url is None:
+        if url is None and (snapshot is None or not snapshot.replay):
             raise ValueError("A correct URL must be provided")
 
         self.url = url
         self.login = login
         self.password = password
+        self.snapshot = snapshot
+        self.payload_sizes = {}
 
     def connect(self) -> str:
         """
@@ -122,7 +153,7 @@ class ADEClient:
 
         return element
 
-    def get_resources(self, detail=11, **params) -> ET.Element:
+    def get_resources(self, detail=FULL_DETAIL, **params) -> ET.Element:
         """
         Get all the available resources from the current ADE project
 
@@ -135,10 +166,69 @@ class ADEClient:
 
         return element
 
+    def get_resources_by_category(self, categories: Iterable[Category], leaves=True,
+                                  **params) -> dict[Category, ET.Element]:
+        """
+        Get the resources of some categories from the current ADE project, with one request per category
+
+        Each category is requested with the lowest degree of details providing the attributes used to build its
+        objects, which makes the responses much smaller than a single request of all the resources.
+
+        :param categories: the categories of the resources to be fetched
+        :param leaves: whether only the leaves of the resources tree are fetched, leaving out the groups
+        :param params: others options to be included in the request query string
+        :return: the XML response element of each category
+        :raise ValueError: if a resource lacks an attribute required for its category, even at the full detail
+        """
+        leaves_only = "true" if leaves else "false"
+
+        resources = {}
+        for category in categories:
+            detail = RESOURCES_DETAIL.get(category, FULL_DETAIL)
+            element = self.get_resources(detail=detail, category=category.value, leaves=leaves_only, **params)
+
+            # a missing attribute would only be noticed by the database, aborting the whole synchronization, so the
+            # category is requested again with all its details
+            missing = self._missing_attribute(category, element)
+            if missing is not None and detail != FULL_DETAIL:
+                logger.warning("The %s resources have no %s attribute at detail %s, fetching them at detail %s",
+                               category.value, missing, detail, FULL_DETAIL)
+
+                detail = FULL_DETAIL
+                element = self.get_resources(detail=detail, category=category.value, leaves=leaves_only, **params)
+                missing = self._missing_attribute(category, element)
+
+            if missing is not None:
+                raise ValueError("The {} resources have no {} attribute at detail {}"
+                                 .format(category.value, missing, detail))
+
+            resources[category] = element
+
+        return resources
+
+    @staticmethod
+    def _missing_attribute(category: Category, element: ET.Element) -> Optional[str]:
+        """
+        Look for an attribute required for the category which a resource lacks
+
+        :param category: the category of the resources
+        :param element: the XML response element representing the resources
+        :return: the first attribute missing, or None if all the resources are complete
+        """
+        for resource in element.iter(tag="resource"):
+            for attribute in RESOURCES_ATTRIBUTES.get(category, ()):
+                if attribute not in resource.attrib:
+                    return attribute
+
+        return None
+
     def _send(self, function: str, **params) -> ET.Element:
         """
         Send a request to the ADE server and parse the XML response
 
+        When a snapshot is used, the raw response is archived in it or, in replay mode, read from it instead of being
+        requested to the ADE server. The size of each response received is recorded in ``payload_sizes``.
+
         :param function: function name to be executed by the API
         :param params: dictionary of params to send in the query string
         :return: the XML element produced by the API
@@ -149,16 +239,27 @@ class ADEClient:
         if self.sessionId is not None:
             params["sessionId"] = self.sessionId
 
-        response = requests.get(self.url, params=params)
-        if response.status_code != 200:
-            raise ConnectionError(
-                "Status code of the response is {}. Maybe check the URL?".format(response.status_code))
+        name = Snapshot.name(function, **params)
+
+        if self.snapshot is not None and self.snapshot.replay:
+            element = self.snapshot.load(name)
+        else:
+            response = requests.get(self.url, params=params)
+            if response.status_code != 200:
+                raise ConnectionError(
+                    "Status code of the response is {}. Maybe check the URL?".format(response.status_code))
+
+            # there is a possibility that the answer is empty. This may be due to the use of an unknown function.
+            if len(response.content) == 0:
+                raise ConnectionError("The response seems to be empty. Maybe the function used is unknown for ADE?")
+
+            self.payload_sizes[name] = len(response.content)
 
-        # there is a possibility that the answer is empty. This may be due to the use of an unknown function.
-        if len(response.content) == 0:
-            raise ConnectionError("The response seems to be empty. Maybe the function used is unknown for ADE?")
+            # the response is archived before being parsed, so that a malformed response can be reproduced
+            if self.snapshot is not None:
+                self.snapshot.save(name, response.content)
 
-        element = ET.fromstring(response.text)
+            element = ET.fromstring(response.text)
 
         # ADE responds with a 200 even in case of failure, with the only. The error message will be in the response XML.
         if element.tag == "error":
@@ -0,0 +1,95 @@
+"""
+Detect the resources booked for overlapping events.
+
+A resource (classroom, instructor or trainee group) is in conflict when two of its events overlap in time. The events
+of each resource are swept in chronological order, which keeps the detection in O(n log n) instead of comparing every
+pair of events.
+"""
+import heapq
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Iterable, List, Union
+
+from .elements import Category, Event
+
+
+@dataclass
+class Conflict:
+    """A conflict is a resource booked for two events at the same time"""
+    category: Category
+    resource: Union[int, str]
+    event_id: int
+    other_event_id: int
+    start_at: datetime
+    end_at: datetime
+
+
+def find_conflicts(events: Iterable[Event]) -> List[Conflict]:
+    """
+    Find the overlapping events of each classroom, instructor and trainee group.
+
+    :param events: the events to be checked
+    :return: the conflicts found, one for each pair of overlapping events of a resource
+    """
+    # group the events by resource, a resource can be listed several times in the same event (ADE allows it)
+    resources = defaultdict(dict)
+    for event in events:
+        for classroom in event.classrooms:
+            resources[(Category.CLASSROOM, classroom.id)][event.id] = event
+        for instructor in event.instructors:
+            resources[(Category.INSTRUCTOR, instructor.id)][event.id] = event
+        for trainee in event.trainees:
+            resources[(Category.TRAINEE, trainee)][event.id] = event
+
+    conflicts = []
+    for (category, resource), booked in resources.items():
+        conflicts.extend(resource_conflicts(category, resource, booked.values()))
+
+    return conflicts
+
+
+def resource_conflicts(category: Category, resource: Union[int, str], events: Iterable) -> List[Conflict]:
+    """
+    Find the overlapping events of a single resource.
+
+    :param category: the category of the resource
+    :param resource: the id of the resource, or the name of the trainee group
+    :param events: the events of the resource, each one listed once, anything with an ``id``, a ``start_at`` and an
+        ``end_at`` can be used
+    :return: the conflicts found, one for each pair of overlapping events
+    """
+    conflicts = []
+    for event, other in _sweep(events):
+        conflicts.append(Conflict(
+            category=category,
+            resource=resource,
+            event_id=other.id,
+            other_event_id=event.id,
+            start_at=event.start_at,
+            end_at=min(event.end_at, other.end_at)
+        ))
+
+    return conflicts
+
+
+def _sweep(events: Iterable) -> Iterable[tuple]:
+    """
+    Sweep the events of a resource in chronological order and yield the overlapping pairs.
+
+    The events still in progress are kept in a heap ordered by their end, so that the finished ones can be discarded
+    as soon as a later event starts.
+
+    :param events: the events of a single resource
+    :return: the pairs of overlapping events, the event starting last comes first
+    """
+    ongoing = []
+    for event in sorted(events, key=lambda item: (item.start_at, item.id)):
+        # an event ending exactly when the next one starts is not a conflict
+        while ongoing and ongoing[0][0] <= event.start_at:
+            heapq.heappop(ongoing)
+
+        for _, _, other in ongoing:
+            yield event, other
+
+        heapq.heappush(ongoing, (event.end_at, event.id, event))
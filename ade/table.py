@@ -0,0 +1,315 @@
+"""
+Columnar storage of the events, for in-process reporting.
+
+The events are stored as NumPy arrays, one per attribute, rather than as a list of objects. The many-to-many relations
+(classrooms, instructors and trainees of the events) are stored in the CSR way: a flat array of the linked ids, and an
+array of offsets giving for each event the slice of the ids that belong to it.
+
+Filters return boolean masks over the events, they can be combined with ``&`` and ``|`` and given to the aggregations.
+
+The times are stored as UTC epoch seconds. The datetimes given to the filters must be timezone-aware: a naive datetime
+would be read as a local time of the machine.
+"""
+from datetime import datetime
+from typing import Iterable, List, Optional
+
+import numpy as np
+
+from .elements import Event, Instructor
+
+# id used in the integer columns when the value is missing
+MISSING = -1
+
+
+class EventTable:
+    """Events stored by columns"""
+    ids: np.ndarray
+    activity_ids: np.ndarray
+    unite_ids: np.ndarray
+    start_at: np.ndarray
+    end_at: np.ndarray
+
+    classroom_offsets: np.ndarray
+    classroom_ids: np.ndarray
+    instructor_offsets: np.ndarray
+    instructor_ids: np.ndarray
+    trainee_offsets: np.ndarray
+    trainee_ids: np.ndarray
+
+    instructor_department_ids: np.ndarray
+
+    trainees: List[str]
+    departments: List[str]
+
+    def __init__(self, events: Iterable[Event], instructors: Optional[Iterable[Instructor]] = None):
+        """
+        Build the columns from parsed events
+
+        :param events: the events to be stored
+        :param instructors: the instructors giving their department, the department of the instructors of the events
+            is used otherwise
+        """
+        ids = []
+        activity_ids = []
+        unite_ids = []
+        start_at = []
+        end_at = []
+
+        classroom_links = ([], [0])
+        instructor_links = ([], [0])
+        trainee_links = ([], [0])
+        self.trainees = []
+        self._trainee_index = {}
+
+        self.departments = []
+        department_index = {}
+        departments = {instructor.id: instructor.department for instructor in instructors or ()}
+        instructor_departments = []
+
+        for event in events:
+            ids.append(event.id)
+            activity_ids.append(event.activity_id)
+            unite_ids.append(getattr(event.unite, "id", MISSING))
+            start_at.append(int(event.start_at.timestamp()))
+            end_at.append(int(event.end_at.timestamp()))
+
+            # ADE allows duplicate resources in an event, only the first one is kept
+            self._link(classroom_links, dict.fromkeys(classroom.id for classroom in event.classrooms))
+            self._link(instructor_links, dict.fromkeys(instructor.id for instructor in event.instructors))
+
+            for instructor in event.instructors:
+                departments.setdefault(instructor.id, instructor.department)
+
+            for trainee in event.trainees:
+                if trainee not in self._trainee_index:
+                    self._trainee_index[trainee] = len(self.trainees)
+                    self.trainees.append(trainee)
+            self._link(trainee_links, dict.fromkeys(self._trainee_index[trainee] for trainee in event.trainees))
+
+        self.ids = np.array(ids, dtype=np.int64)
+        self.activity_ids = np.array(activity_ids, dtype=np.int64)
+        self.unite_ids = np.array(unite_ids, dtype=np.int64)
+        self.start_at = np.array(start_at, dtype=np.int64)
+        self.end_at = np.array(end_at, dtype=np.int64)
+
+        self.classroom_ids = np.array(classroom_links[0], dtype=np.int64)
+        self.classroom_offsets = np.array(classroom_links[1], dtype=np.int64)
+        self.instructor_ids = np.array(instructor_links[0], dtype=np.int64)
+
+        # department of each instructor link, so that the hours can be summed by department
+        for instructor_id in instructor_links[0]:
+            department = departments.get(instructor_id)
+            if department is None:
+                instructor_departments.append(MISSING)
+                continue
+
+            if department not in department_index:
+                department_index[department] = len(self.departments)
+                self.departments.append(department)
+            instructor_departments.append(department_index[department])
+
+        self.instructor_department_ids = np.array(instructor_departments, dtype=np.int64)
+        self.instructor_offsets = np.array(instructor_links[1], dtype=np.int64)
+        self.trainee_ids = np.array(trainee_links[0], dtype=np.int64)
+        self.trainee_offsets = np.array(trainee_links[1], dtype=np.int64)
+
+        # index of the event owning each link, used to go from the links to the events and back
+        self._classroom_owners = self._owners(self.classroom_offsets)
+        self._instructor_owners = self._owners(self.instructor_offsets)
+        self._trainee_owners = self._owners(self.trainee_offsets)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def durations(self) -> np.ndarray:
+        """
+        :return: the duration of each event, in seconds
+        """
+        return self.end_at - self.start_at
+
+    def between(self, start: datetime, end: datetime) -> np.ndarray:
+        """
+        Select the events taking place, even partially, during a time range
+
+        :param start: the start of the time range, timezone-aware
+        :param end: the end of the time range, timezone-aware
+        :return: the mask of the selected events
+        """
+        return (self.start_at < int(end.timestamp())) & (self.end_at > int(start.timestamp()))
+
+    def with_unite(self, unite_id: int) -> np.ndarray:
+        """
+        Select the events of an unite
+
+        :param unite_id: the id of the unite
+        :return: the mask of the selected events
+        """
+        return self.unite_ids == unite_id
+
+    def with_classroom(self, classroom_id: int) -> np.ndarray:
+        """
+        Select the events taking place in a classroom
+
+        :param classroom_id: the id of the classroom
+        :return: the mask of the selected events
+        """
+        return self._select(self._classroom_owners, self.classroom_ids == classroom_id)
+
+    def with_instructor(self, instructor_id: int) -> np.ndarray:
+        """
+        Select the events of an instructor
+
+        :param instructor_id: the id of the instructor
+        :return: the mask of the selected events
+        """
+        return self._select(self._instructor_owners, self.instructor_ids == instructor_id)
+
+    def with_trainee(self, trainee: str) -> np.ndarray:
+        """
+        Select the events of a trainee group
+
+        :param trainee: the name of the trainee group
+        :return: the mask of the selected events
+        """
+        if trainee not in self._trainee_index:
+            return np.zeros(len(self), dtype=bool)
+
+        return self._select(self._trainee_owners, self.trainee_ids == self._trainee_index[trainee])
+
+    def hours_by_unite(self, mask: Optional[np.ndarray] = None) -> dict[int, float]:
+        """
+        Sum the hours of the events of each unite
+
+        :param mask: the mask of the events to be counted, all the events by default
+        :return: the number of hours of each unite
+        """
+        mask = self._all(mask) & (self.unite_ids != MISSING)
+
+        return self._sum_by(self.unite_ids[mask], self.durations()[mask] / 3600)
+
+    def hours_by_classroom(self, mask: Optional[np.ndarray] = None) -> dict[int, float]:
+        """
+        Sum the hours of the events of each classroom
+
+        :param mask: the mask of the events to be counted, all the events by default
+        :return: the number of hours of each classroom
+        """
+        return self._sum_links(self._classroom_owners, self.classroom_ids, self.durations() / 3600, mask)
+
+    def hours_by_instructor(self, mask: Optional[np.ndarray] = None) -> dict[int, float]:
+        """
+        Sum the hours of the events of each instructor
+
+        :param mask: the mask of the events to be counted, all the events by default
+        :return: the number of hours of each instructor
+        """
+        return self._sum_links(self._instructor_owners, self.instructor_ids, self.durations() / 3600, mask)
+
+    def hours_by_department(self, mask: Optional[np.ndarray] = None) -> dict[str, float]:
+        """
+        Sum the hours of the instructors of each department
+
+        An event with several instructors of the same department counts once for each of them.
+
+        :param mask: the mask of the events to be counted, all the events by default
+        :return: the number of instructor hours of each department
+        """
+        links = self._all(mask)[self._instructor_owners] & (self.instructor_department_ids != MISSING)
+        hours = self.durations()[self._instructor_owners[links]] / 3600
+
+        sums = self._sum_by(self.instructor_department_ids[links], hours)
+
+        return {self.departments[department]: total for department, total in sums.items()}
+
+    def occupancy_by_classroom(self, start: datetime, end: datetime) -> dict[int, float]:
+        """
+        Compute the occupancy rate of each classroom during a time range
+
+        The events are clipped to the time range, so an event partially in the range only counts for its part in it.
+
+        :param start: the start of the time range, timezone-aware
+        :param end: the end of the time range, timezone-aware
+        :return: the share of the time range during which each classroom is booked
+        :raise ValueError: if the time range is empty or reversed
+        """
+        start = int(start.timestamp())
+        end = int(end.timestamp())
+
+        if end <= start:
+            raise ValueError("The end of the time range must be after its start")
+
+        booked = np.minimum(self.end_at, end) - np.maximum(self.start_at, start)
+        booked = np.clip(booked, 0, None) / (end - start)
+
+        return self._sum_links(self._classroom_owners, self.classroom_ids, booked, booked > 0)
+
+    def _all(self, mask: Optional[np.ndarray]) -> np.ndarray:
+        """
+        :param mask: a mask of the events, or None
+        :return: the mask given, or a mask selecting all the events
+        """
+        if mask is None:
+            return np.ones(len(self), dtype=bool)
+
+        return mask
+
+    def _select(self, owners: np.ndarray, links: np.ndarray) -> np.ndarray:
+        """
+        Select the events owning some links
+
+        :param owners: the index of the event owning each link
+        :param links: the mask of the links
+        :return: the mask of the events owning at least one of the links
+        """
+        mask = np.zeros(len(self), dtype=bool)
+        mask[owners[links]] = True
+
+        return mask
+
+    def _sum_links(self, owners: np.ndarray, ids: np.ndarray, values: np.ndarray,
+                   mask: Optional[np.ndarray]) -> dict[int, float]:
+        """
+        Sum a value of the events for each linked id
+
+        :param owners: the index of the event owning each link
+        :param ids: the linked id of each link
+        :param values: the value of each event
+        :param mask: the mask of the events to be counted, all the events by default
+        :return: the sum of the values for each linked id
+        """
+        links = self._all(mask)[owners]
+
+        return self._sum_by(ids[links], values[owners[links]])
+
+    @staticmethod
+    def _sum_by(keys: np.ndarray, values: np.ndarray) -> dict[int, float]:
+        """
+        Sum values grouped by keys
+
+        :param keys: the key of each value
+        :param values: the values to be summed
+        :return: the sum of the values for each key
+        """
+        unique, inverse = np.unique(keys, return_inverse=True)
+        sums = np.bincount(inverse, weights=values, minlength=len(unique))
+
+        return dict(zip(unique.tolist(), sums.tolist()))
+
+    @staticmethod
+    def _link(relation: tuple[list, list], ids: Iterable[int]):
+        """
+        Append the links of an event to a relation being built
+
+        :param relation: the linked ids and the offsets built so far
+        :param ids: the linked ids of the event
+        """
+        relation[0].extend(ids)
+        relation[1].append(len(relation[0]))
+
+    @staticmethod
+    def _owners(offsets: np.ndarray) -> np.ndarray:
+        """
+        :param offsets: the offsets of a relation
+        :return: the index of the event owning each link of the relation
+        """
+        return np.repeat(np.arange(len(offsets) - 1), np.diff(offsets))
@@ -6,10 +6,12 @@ account with special permissions.
 """
 # noinspection PyPep8Naming
 import xml.etree.ElementTree as ET
+from typing import Optional
 
 import requests
 
 from ade.elements import Unite
+from snapshot import Snapshot
 
 
 class AurionClient:
@@ -21,21 +23,25 @@ class AurionClient:
     password: str
     database: str
 
-    def __init__(self, url, login, password, database):
+    snapshot: Optional[Snapshot] = None
+
+    def __init__(self, url, login, password, database, snapshot: Optional[Snapshot] = None):
         """
         Create a new Web Aurion API client
 
         :param url: URL of the Aurion server
         :param login: login of the account to be used
         :param password: password of the account to be used
+        :param snapshot: snapshot in which the responses are archived, or from which they are replayed
         """
-        if url is None:
+        if url is None and (snapshot is None or not snapshot.replay):
             raise ValueError("A correct URL must be provided")
 
         self.url = url
         self.login = login
         self.password = password
         self.database = database
+        self.snapshot = snapshot
 
     def get_unites(self) -> list[Unite]:
         """
@@ -85,9 +91,17 @@ class AurionClient:
         """
         Execute a specific request
 
+        When a snapshot is used, the raw response is archived in it or, in replay mode, read from it instead of being
+        requested to the Aurion server.
+
         :param request_id: The request id to be executed by the API
         :return: the XML element produced by the API
         """
+        name = Snapshot.name("aurion-{}".format(request_id))
+
+        if self.snapshot is not None and self.snapshot.replay:
+            return self.snapshot.load(name)
+
         payload = """
             <executeFavori>
                 <favori><id>{request_id}</id></favori>
@@ -102,6 +116,10 @@ class AurionClient:
         )
 
         response = requests.post(self.url, data=data)
+
+        if self.snapshot is not None:
+            self.snapshot.save(name, response.content)
+
         element = ET.fromstring(response.text)
 
         return element
@@ -1,14 +1,62 @@
 """
 Interact with the database
 """
-from collections import Iterator
+from collections import defaultdict, namedtuple
 from contextlib import contextmanager
-from typing import List, Tuple
+from datetime import datetime, timedelta
+from typing import Iterator, List, Optional, Tuple, Union
 
 import psycopg
-from psycopg import Transaction
-
-from ade import Classroom, Instructor, Unite, Event
+from psycopg import Transaction, sql
+from psycopg.rows import dict_row
+
+from ade import Classroom, Instructor, Unite, Event, Conflict, Category, resource_conflicts
+
+# an event booking a resource, as read from the database to compute the conflicts
+Booking = namedtuple("Booking", ["id", "start_at", "end_at"])
+
+# channel on which the changes computed after each synchronization are announced
+CHANGES_CHANNEL = "event_changes"
+
+# channel on which each committed synchronization is announced
+SYNC_CHANNEL = "planif_sync"
+
+# condition selecting the events of each kind of resource
+RESOURCE_FILTERS = {
+    "trainee": "events.trainees @> ARRAY [%(value)s]::TEXT[]",
+    "instructor": "events.id IN (SELECT event_id FROM events_instructors WHERE instructor_id = %(value)s::INTEGER)",
+    "classroom": "events.id IN (SELECT event_id FROM events_classrooms WHERE classroom_id = %(value)s::INTEGER)",
+    "unite": "events.unite_id = %(value)s::INTEGER",
+}
+
+# tables whose constraints and secondary indexes are dropped during a bulk load, their definitions are read from the
+# catalogs of Postgresql before being dropped so that they are rebuilt exactly as declared in the schema
+BULK_TABLES = ("events", "events_classrooms", "events_instructors")
+
+# foreign keys of the events tables, used to report the orphan references when one of them cannot be restored
+# (table, column, referenced table, referenced column)
+BULK_FOREIGN_KEYS = (
+    ("events", "unite_id", "unites", "id"),
+    ("events_classrooms", "event_id", "events", "id"),
+    ("events_classrooms", "classroom_id", "classrooms", "id"),
+    ("events_instructors", "event_id", "events", "id"),
+    ("events_instructors", "instructor_id", "instructors", "id"),
+)
+
+# state of each event that is compared between two synchronizations, the relations are aggregated into sorted arrays
+# so that they can be compared directly
+EVENTS_STATE_SQL = """
+    SELECT events.id,
+           events.start_at,
+           events.end_at,
+           COALESCE(
+               (SELECT array_agg(DISTINCT classroom_id) FROM events_classrooms WHERE event_id = events.id), '{}'
+           ) AS classrooms,
+           COALESCE(
+               (SELECT array_agg(DISTINCT instructor_id) FROM events_instructors WHERE event_id = events.id), '{}'
+           ) AS instructors
+    FROM events
+"""
 
 
 class Database:
@@ -35,6 +83,74 @@ class Database:
         with Transaction(self.connection, savepoint_name=None, force_rollback=False) as tx:
             yield tx
 
+    @contextmanager
+    def bulk_load(self):
+        """
+        Start a context block in which the events tables are loaded without their constraints and indexes.
+
+        The foreign keys, primary keys and secondary indexes of the events tables are dropped when entering the block,
+        so the rows are copied without being checked one by one. They are rebuilt once from their original definitions
+        when leaving the block, each foreign key being validated in a single pass. This must be done inside a
+        transaction, so that the constraints are restored if anything fails.
+
+        :raise ValueError: if some references from ADE are orphans, in which case the constraints cannot be restored
+        """
+        constraints = [(table, *constraint) for table in BULK_TABLES for constraint in self._constraints(table)]
+        indexes = [index for table in BULK_TABLES for index in self._indexes(table)]
+
+        # the foreign keys are dropped first, since some of them depend on the primary key of the events
+        for table, name, kind, _ in sorted(constraints, key=lambda constraint: constraint[2] != "f"):
+            self._alter(table, "DROP CONSTRAINT {}", name)
+
+        for name, _ in indexes:
+            self.cursor.execute(sql.SQL("DROP INDEX {}").format(sql.Identifier(name)))
+
+        yield
+
+        for table, name, kind, definition in sorted(constraints, key=lambda constraint: constraint[2] != "p"):
+            if kind == "p":
+                self._alter(table, "ADD CONSTRAINT {} {}", name, sql.SQL(definition))
+                continue
+
+            # each foreign key is validated in a savepoint, the orphans are only searched when one of them fails since
+            # the error of Postgresql only reports the first one
+            try:
+                with self.connection.transaction():
+                    self._alter(table, "ADD CONSTRAINT {} {}", name, sql.SQL(definition))
+            except psycopg.errors.ForeignKeyViolation as error:
+                orphans = self.find_orphans()
+                details = ", ".join("{}.{} = {}".format(*orphan) for orphan in orphans[:20])
+                raise ValueError("{} orphan references from ADE: {}".format(len(orphans), details)) from error
+
+        for _, definition in indexes:
+            self.cursor.execute(definition)
+
+    def find_orphans(self) -> List[Tuple[str, str, int]]:
+        """
+        Find the references of the events tables to rows which do not exist
+
+        :return: the table, the column and the value of each orphan reference
+        """
+        orphans = []
+        for table, column, reference, reference_column in BULK_FOREIGN_KEYS:
+            query = sql.SQL("""
+                SELECT DISTINCT {column}
+                FROM {table}
+                WHERE {column} IS NOT NULL
+                  AND NOT EXISTS (SELECT 1 FROM {reference} WHERE {reference}.{reference_column} = {table}.{column})
+                ORDER BY {column}
+            """).format(
+                table=sql.Identifier(table),
+                column=sql.Identifier(column),
+                reference=sql.Identifier(reference),
+                reference_column=sql.Identifier(reference_column)
+            )
+
+            self.cursor.execute(query)
+            orphans.extend((table, column, value) for value, in self.cursor.fetchall())
+
+        return orphans
+
     def populate_classrooms(self, classrooms: List[Classroom]):
         """
         Populate classroom table into the database
@@ -123,9 +239,384 @@ class Database:
 
          :param events: list of unites to be added
          """
-        events_copy = "COPY events (id, activity_id, name, start_at, end_at, unite_id, trainees) FROM STDIN"
-
         # we populate the "events" table with the specific data
+        self._copy_events(events, "events")
+
+        # then we introduce the relation to the others data
+        self._copy_relations(events)
+
+    def populate_activities(self, activities):
+        """
+        Populate activity table into the database
+
+        :param activities: list of activities to be added
+        """
+        self.cursor.execute("""
+            CREATE TEMPORARY TABLE IF NOT EXISTS activities_temp
+            (
+                id INTEGER PRIMARY KEY,
+                description TEXT,
+                category TEXT,
+                info TEXT
+            );
+        """)
+
+        activities_sql = "COPY activities_temp (id, description, category, info) FROM STDIN"
+
+        with self.cursor.copy(activities_sql) as copy:
+            for activity in activities:
+                data = (activity.id, activity.description, activity.category, activity.info)
+                copy.write_row(data)
+
+        # we must remember that ADE gives us the following guarantee
+        # - an event necessarily has an associated activity
+        # - an activity may not have an event
+        # so we do the data fusion in order to keep the activities with an associated event
+
+        # it is better to do this merge on the Postgresql side than on the Python side because the database is much
+        # more efficient on several orders of magnitude for this kind of operation
+
+        self.cursor.execute("""
+            UPDATE events
+                SET description = activity.description,
+                    category = activity.category,
+                    info = activity.info
+                FROM activities_temp AS activity
+                WHERE events.activity_id = activity.id
+        """)
+
+    def populate_conflicts(self, conflicts: List[Conflict]):
+        """
+        Populate conflict table into the database
+
+        :param conflicts: list of conflicts to be added
+        """
+        sql = "COPY conflicts (category, resource, event_id, other_event_id, start_at, end_at) FROM STDIN"
+
+        def extract(item: Conflict) -> Tuple[str, str, int, int, datetime, datetime]:
+            """
+            Extract the tuple of data to insert in the database
+            :param item: the conflict to be used
+            :return: the tuple of data
+            """
+            return item.category.value, str(item.resource), item.event_id, item.other_event_id, item.start_at, \
+                item.end_at
+
+        with self.cursor.copy(sql) as copy:
+            for conflict in conflicts:
+                copy.write_row(extract(conflict))
+
+    def snapshot_events(self, ids: Optional[List[int]] = None):
+        """
+        Keep a copy of the current state of the events, before the tables are cleaned.
+
+        The snapshot lives in a temporary table dropped at the end of the transaction, it is used by
+        ``populate_changes`` to compute what has changed during the synchronization.
+
+        :param ids: the ids of the events to be kept, all the events by default
+        """
+        self.cursor.execute("DROP TABLE IF EXISTS events_snapshot")
+        self.cursor.execute("CREATE TEMPORARY TABLE events_snapshot ON COMMIT DROP AS " + EVENTS_STATE_SQL +
+                            " WITH NO DATA")
+        self.cursor.execute("INSERT INTO events_snapshot " + self._events_state(ids), dict(ids=ids))
+
+    def populate_changes(self, ids: Optional[List[int]] = None) -> int:
+        """
+        Populate the event changes table by comparing the new events with the snapshot taken by ``snapshot_events``,
+        then announce them on the ``event_changes`` channel.
+
+        The notification is only delivered to the listeners once the transaction is committed. Its JSON payload contains
+        the ``changed_at`` timestamp and the ``count`` of the changes, which allows consumers to read only the rows of
+        this synchronization.
+
+        On a full synchronization with an empty snapshot, such as the first one or one following a manual truncate,
+        there is no previous state to compare with: nothing is logged, otherwise every event would be reported as
+        added.
+
+        :param ids: the ids of the events to be compared, the same as the ones given to ``snapshot_events``
+        :return: the number of changed events
+        """
+        if ids is None:
+            self.cursor.execute("SELECT EXISTS (SELECT 1 FROM events_snapshot)")
+            if not self.cursor.fetchone()[0]:
+                return 0
+
+        # the diff is done on the Postgresql side, since both states are already in the database
+        self.cursor.execute("""
+            WITH current AS (""" + self._events_state(ids) + """)
+            INSERT INTO event_changes (event_id, kind, changes, previous_start_at, previous_end_at, start_at, end_at,
+                                       previous_classrooms, classrooms, previous_instructors, instructors)
+            SELECT COALESCE(current.id, previous.id),
+                   CASE
+                       WHEN previous.id IS NULL THEN 'added'
+                       WHEN current.id IS NULL THEN 'removed'
+                       ELSE 'modified'
+                   END,
+                   array_remove(ARRAY [
+                       CASE
+                           WHEN previous.start_at <> current.start_at OR previous.end_at <> current.end_at
+                           THEN 'rescheduled'
+                       END,
+                       CASE WHEN previous.classrooms <> current.classrooms THEN 'classrooms' END,
+                       CASE WHEN previous.instructors <> current.instructors THEN 'instructors' END
+                   ], NULL),
+                   previous.start_at,
+                   previous.end_at,
+                   current.start_at,
+                   current.end_at,
+                   previous.classrooms,
+                   current.classrooms,
+                   previous.instructors,
+                   current.instructors
+            FROM events_snapshot AS previous
+                FULL JOIN current ON previous.id = current.id
+            WHERE previous.id IS NULL
+               OR current.id IS NULL
+               OR previous.start_at <> current.start_at
+               OR previous.end_at <> current.end_at
+               OR previous.classrooms <> current.classrooms
+               OR previous.instructors <> current.instructors
+        """, dict(ids=ids))
+
+        count = self.cursor.rowcount
+        if count > 0:
+            payload = "json_build_object('changed_at', now(), 'count', %s::INTEGER)::TEXT"
+            self.cursor.execute("SELECT pg_notify(%s, {})".format(payload), (CHANGES_CHANNEL, count))
+
+        return count
+
+    def purge_changes(self, retention: timedelta) -> int:
+        """
+        Remove the event changes older than the retention period, so that the table does not grow without limit
+
+        :param retention: how long the changes are kept
+        :return: the number of changes removed
+        """
+        self.cursor.execute("DELETE FROM event_changes WHERE changed_at < now() - %s", (retention,))
+
+        return self.cursor.rowcount
+
+    def find_event_ids(self, resource: str, value: Union[int, str]) -> List[int]:
+        """
+        Find the ids of the events of a resource
+
+        :param resource: the kind of the resource, "trainee", "instructor", "classroom" or "unite"
+        :param value: the id of the resource, or the name of the trainee group
+        :return: the ids of the events found
+        """
+        self.cursor.execute("SELECT events.id FROM events WHERE " + RESOURCE_FILTERS[resource], dict(value=value))
+
+        return [id for id, in self.cursor.fetchall()]
+
+    def refresh_events(self, events: List[Event], removed: List[int]):
+        """
+        Replace some events and their relations, leaving the other events untouched
+
+        The information coming from the activities is kept for the events whose activity is already known. The
+        resources of the events must already be in the database, a new resource requires a full synchronization. The
+        conflicts are not updated, see ``refresh_conflicts``.
+
+        :param events: list of events to be replaced, or added if they are new
+        :param removed: ids of the events to be removed
+        """
+        ids = [event.id for event in events] + removed
+
+        self.cursor.execute("DROP TABLE IF EXISTS events_refresh")
+        self.cursor.execute("CREATE TEMPORARY TABLE events_refresh (LIKE events INCLUDING DEFAULTS) ON COMMIT DROP")
+        self._copy_events(events, "events_refresh")
+
+        self.cursor.execute("""
+            UPDATE events_refresh
+                SET description = activity.description,
+                    category = activity.category,
+                    info = activity.info
+                FROM (
+                    SELECT DISTINCT ON (activity_id) activity_id, description, category, info
+                    FROM events
+                    WHERE activity_id IN (SELECT activity_id FROM events_refresh)
+                    ORDER BY activity_id, description IS NULL
+                ) AS activity
+                WHERE events_refresh.activity_id = activity.activity_id
+        """)
+
+        self.cursor.execute("DELETE FROM events_classrooms WHERE event_id = ANY(%s)", (ids,))
+        self.cursor.execute("DELETE FROM events_instructors WHERE event_id = ANY(%s)", (ids,))
+        self.cursor.execute("DELETE FROM events WHERE id = ANY(%s)", (ids,))
+
+        self.cursor.execute("INSERT INTO events SELECT * FROM events_refresh")
+        self._copy_relations(events)
+
+    def find_known_activities(self, activity_ids: List[int]) -> set[int]:
+        """
+        Find which activities are already known, through the events having them
+
+        :param activity_ids: the ids of the activities
+        :return: the ids of the activities with some information
+        """
+        self.cursor.execute("""
+            SELECT DISTINCT activity_id
+            FROM events
+            WHERE activity_id = ANY(%s)
+              AND (description IS NOT NULL OR category IS NOT NULL OR info IS NOT NULL)
+        """, (activity_ids,))
+
+        return {id for id, in self.cursor.fetchall()}
+
+    def refresh_conflicts(self, events: List[Event], ids: List[int]) -> int:
+        """
+        Compute again the conflicts of the resources touched by some replaced events
+
+        The touched resources are the ones of the new events, and the ones in conflict with the events before they
+        were replaced. All the conflicts of these resources are replaced, the other ones are left untouched.
+
+        :param events: list of the events which have been replaced, or added
+        :param ids: ids of the events which have been replaced, added or removed
+        :return: the number of conflicts of the touched resources
+        """
+        touched = set()
+        for event in events:
+            touched.update((Category.CLASSROOM.value, str(classroom.id)) for classroom in event.classrooms)
+            touched.update((Category.INSTRUCTOR.value, str(instructor.id)) for instructor in event.instructors)
+            touched.update((Category.TRAINEE.value, trainee) for trainee in event.trainees)
+
+        self.cursor.execute("""
+            SELECT category, resource FROM conflicts WHERE event_id = ANY(%(ids)s) OR other_event_id = ANY(%(ids)s)
+        """, dict(ids=ids))
+        touched.update(self.cursor.fetchall())
+
+        categories = [category for category, _ in touched]
+        resources = [resource for _, resource in touched]
+
+        self.cursor.execute("""
+            DELETE FROM conflicts
+            WHERE (category, resource) IN (SELECT * FROM unnest(%s::TEXT[], %s::TEXT[]))
+        """, (categories, resources))
+
+        def ids_of(category: Category) -> List[int]:
+            return [int(resource) for kind, resource in touched if kind == category.value]
+
+        # the events of the touched resources, as (category, resource, event) rows
+        self.cursor.execute("""
+            SELECT 'classroom', classroom_id::TEXT, events.id, events.start_at, events.end_at
+            FROM events_classrooms
+                JOIN events ON events.id = events_classrooms.event_id
+            WHERE classroom_id = ANY(%(classrooms)s)
+            UNION ALL
+            SELECT 'instructor', instructor_id::TEXT, events.id, events.start_at, events.end_at
+            FROM events_instructors
+                JOIN events ON events.id = events_instructors.event_id
+            WHERE instructor_id = ANY(%(instructors)s)
+            UNION ALL
+            SELECT DISTINCT 'trainee', trainee, events.id, events.start_at, events.end_at
+            FROM events, unnest(events.trainees) AS trainee
+            WHERE events.trainees && %(trainees)s::TEXT[]
+              AND trainee = ANY(%(trainees)s)
+        """, dict(
+            classrooms=ids_of(Category.CLASSROOM),
+            instructors=ids_of(Category.INSTRUCTOR),
+            trainees=[resource for kind, resource in touched if kind == Category.TRAINEE.value]
+        ))
+
+        bookings = defaultdict(list)
+        for category, resource, id, start_at, end_at in self.cursor.fetchall():
+            bookings[(category, resource)].append(Booking(id=id, start_at=start_at, end_at=end_at))
+
+        conflicts = []
+        for (category, resource), booked in bookings.items():
+            conflicts.extend(resource_conflicts(Category(category), resource, booked))
+
+        self.populate_conflicts(conflicts)
+
+        return len(conflicts)
+
+    def notify_sync(self):
+        """
+        Announce the synchronization on the ``planif_sync`` channel.
+
+        The notification is only delivered to the listeners once the transaction is committed, which allows them to
+        drop what they kept from the previous synchronization.
+        """
+        self.cursor.execute("SELECT pg_notify(%s, now()::TEXT)", (SYNC_CHANNEL,))
+
+    def find_events(self, resource: str, value: Union[int, str], start_at: datetime, end_at: datetime) -> List[dict]:
+        """
+        Find the events of a resource taking place, even partially, during a time range
+
+        :param resource: the kind of the resource, "trainee", "instructor", "classroom" or "unite"
+        :param value: the id of the resource, or the name of the trainee group
+        :param start_at: the start of the time range
+        :param end_at: the end of the time range
+        :return: the events found, ordered by start
+        """
+        query = """
+            SELECT events.id,
+                   events.name,
+                   events.description,
+                   events.category,
+                   events.info,
+                   events.start_at,
+                   events.end_at,
+                   events.trainees,
+                   unites.code AS unite,
+                   ARRAY(
+                       SELECT classrooms.name
+                       FROM events_classrooms
+                           JOIN classrooms ON classrooms.id = events_classrooms.classroom_id
+                       WHERE events_classrooms.event_id = events.id
+                   ) AS classrooms,
+                   ARRAY(
+                       SELECT instructors.name
+                       FROM events_instructors
+                           JOIN instructors ON instructors.id = events_instructors.instructor_id
+                       WHERE events_instructors.event_id = events.id
+                   ) AS instructors
+            FROM events
+                LEFT JOIN unites ON unites.id = events.unite_id
+            WHERE {}
+              AND events.start_at < %(end_at)s
+              AND events.end_at > %(start_at)s
+            ORDER BY events.start_at, events.id
+        """.format(RESOURCE_FILTERS[resource])
+
+        # a dedicated cursor returns the rows as dictionaries, leaving the shared cursor untouched
+        with self.connection.cursor(row_factory=dict_row) as cursor:
+            cursor.execute(query, dict(value=value, start_at=start_at, end_at=end_at))
+            return cursor.fetchall()
+
+    def notifications(self, channel: str) -> Iterator[str]:
+        """
+        Listen to a channel and yield the payload of each notification received.
+
+        The connection must be in autocommit mode, otherwise the notifications are not received.
+
+        :param channel: the channel to listen to
+        """
+        self.cursor.execute(sql.SQL("LISTEN {}").format(sql.Identifier(channel)))
+
+        for notify in self.connection.notifies():
+            yield notify.payload
+
+    @staticmethod
+    def _events_state(ids: Optional[List[int]]) -> str:
+        """
+        :param ids: the ids of the events, or None for all the events
+        :return: the query of the state of the events, with an ``ids`` param if some ids are given
+        """
+        if ids is None:
+            return EVENTS_STATE_SQL
+
+        return EVENTS_STATE_SQL + " WHERE events.id = ANY(%(ids)s)"
+
+    def _copy_events(self, events: List[Event], table: str):
+        """
+        Copy the specific data of the events into a table shaped like the event table
+
+        :param events: list of events to be added
+        :param table: the table in which the events are copied
+        """
+        events_copy = sql.SQL("COPY {} (id, activity_id, name, start_at, end_at, unite_id, trainees) FROM STDIN") \
+            .format(sql.Identifier(table))
+
         with self.cursor.copy(events_copy) as copy:
             for event in events:
                 data = (
@@ -139,7 +630,12 @@ class Database:
                 )
                 copy.write_row(data)
 
-        # then we introduce the relation to the others data
+    def _copy_relations(self, events: List[Event]):
+        """
+        Copy the relations of the events to the classrooms and instructors
+
+        :param events: list of events whose relations are added
+        """
         # we populate the table "events_classrooms", as this is a many-to-many relation
         events_classrooms_copy = \
             "COPY events_classrooms (event_id, classroom_id) FROM STDIN"
@@ -163,52 +659,62 @@ class Database:
                 for instructor in unite.instructors:
                     copy.write_row((unite.id, instructor.id))
 
-    def populate_activities(self, activities):
+    def _constraints(self, table: str) -> List[Tuple[str, str, str]]:
         """
-        Populate activity table into the database
+        Read the primary key and the foreign keys of a table
 
-        :param activities: list of activities to be added
+        :param table: the table whose constraints are read
+        :return: the name, the kind ("p" or "f") and the definition of each constraint
         """
         self.cursor.execute("""
-            CREATE TEMPORARY TABLE IF NOT EXISTS activities_temp
-            (
-                id INTEGER PRIMARY KEY,
-                description TEXT,
-                category TEXT,
-                info TEXT
-            );
-        """)
+            SELECT conname, contype, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE conrelid = %s::regclass
+              AND contype IN ('p', 'f')
+            ORDER BY conname
+        """, (table,))
 
-        activities_sql = "COPY activities_temp (id, description, category, info) FROM STDIN"
+        return self.cursor.fetchall()
 
-        with self.cursor.copy(activities_sql) as copy:
-            for activity in activities:
-                data = (activity.id, activity.description, activity.category, activity.info)
-                copy.write_row(data)
+    def _indexes(self, table: str) -> List[Tuple[str, str]]:
+        """
+        Read the secondary indexes of a table, the indexes backing a constraint are left aside
 
-        # we must remember that ADE gives us the following guarantee
-        # - an event necessarily has an associated activity
-        # - an activity may not have an event
-        # so we do the data fusion in order to keep the activities with an associated event
+        :param table: the table whose indexes are read
+        :return: the name and the definition of each index
+        """
+        self.cursor.execute("""
+            SELECT pg_class.relname, pg_get_indexdef(pg_index.indexrelid)
+            FROM pg_index
+                     JOIN pg_class ON pg_class.oid = pg_index.indexrelid
+            WHERE pg_index.indrelid = %s::regclass
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint WHERE pg_constraint.conindid = pg_index.indexrelid)
+            ORDER BY pg_class.relname
+        """, (table,))
 
-        # it is better to do this merge on the Postgresql side than on the Python side because the database is much
-        # more efficient on several orders of magnitude for this kind of operation
+        return self.cursor.fetchall()
 
-        self.cursor.execute("""
-            UPDATE events
-                SET description = activity.description,
-                    category = activity.category,
-                    info = activity.info
-                FROM activities_temp AS activity
-                WHERE events.activity_id = activity.id
-        """)
+    def _alter(self, table: str, action: str, *identifiers: Union[str, sql.Composable]):
+        """
+        Alter a table
+
+        :param table: the table to be altered
+        :param action: the action to be executed, with a placeholder for each identifier
+        :param identifiers: the identifiers used in the action, the strings are quoted as SQL identifiers
+        """
+        query = sql.SQL("ALTER TABLE {} " + action).format(
+            sql.Identifier(table),
+            *(sql.Identifier(item) if isinstance(item, str) else item for item in identifiers)
+        )
+
+        self.cursor.execute(query)
 
     def clean(self):
         """
         Clean existing tables in the database.
         """
         truncate_sql = "TRUNCATE classrooms, events, events_classrooms, events_instructors, instructors, unites, " \
-                       "groups, users"
+                       "groups, users, conflicts"
 
         self.cursor.execute(truncate_sql)
 
@@ -49,6 +49,44 @@ CREATE TABLE IF NOT EXISTS events_instructors
     PRIMARY KEY (event_id, instructor_id)
 );
 
+-- indexes used to read the events of a resource
+CREATE INDEX IF NOT EXISTS events_start_at_idx ON events (start_at);
+CREATE INDEX IF NOT EXISTS events_unite_id_idx ON events (unite_id);
+CREATE INDEX IF NOT EXISTS events_trainees_idx ON events USING GIN (trainees);
+CREATE INDEX IF NOT EXISTS events_classrooms_classroom_id_idx ON events_classrooms (classroom_id);
+CREATE INDEX IF NOT EXISTS events_instructors_instructor_id_idx ON events_instructors (instructor_id);
+
+CREATE TABLE IF NOT EXISTS conflicts
+(
+    category       TEXT                     NOT NULL,
+    resource       TEXT                     NOT NULL,
+    event_id       INTEGER                  NOT NULL,
+    other_event_id INTEGER                  NOT NULL,
+    start_at       TIMESTAMP WITH TIME ZONE NOT NULL,
+    end_at         TIMESTAMP WITH TIME ZONE NOT NULL,
+    PRIMARY KEY (category, resource, event_id, other_event_id)
+);
+
+-- changes between two synchronizations, kept for CHANGES_RETENTION_DAYS days (30 by default)
+CREATE TABLE IF NOT EXISTS event_changes
+(
+    id                   SERIAL PRIMARY KEY,
+    event_id             INTEGER                  NOT NULL,
+    kind                 TEXT                     NOT NULL CHECK (kind IN ('added', 'removed', 'modified')),
+    changes              TEXT[] DEFAULT '{}',
+    previous_start_at    TIMESTAMP WITH TIME ZONE,
+    previous_end_at      TIMESTAMP WITH TIME ZONE,
+    start_at             TIMESTAMP WITH TIME ZONE,
+    end_at               TIMESTAMP WITH TIME ZONE,
+    previous_classrooms  INTEGER[],
+    classrooms           INTEGER[],
+    previous_instructors INTEGER[],
+    instructors          INTEGER[],
+    changed_at           TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS event_changes_changed_at_idx ON event_changes (changed_at);
+
 CREATE TABLE IF NOT EXISTS users
 (
     login   TEXT PRIMARY KEY NOT NULL,
@@ -62,6 +100,11 @@ CREATE TABLE IF NOT EXISTS groups
     trainee TEXT
 );
 
+-- DO NOT EXECUTE
+-- TEMPORARY TABLE CODE FOR the events snapshot used to compute event_changes
+-- CREATE TEMPORARY TABLE events_snapshot ON COMMIT DROP AS
+-- SELECT id, start_at, end_at, classrooms, instructors FROM events (with aggregated relations);
+
 -- DO NOT EXECUTE
 -- TEMPORARY TABLE CODE FOR activities
 -- CREATE TEMPORARY TABLE IF NOT EXISTS activities_temp
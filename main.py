@@ -1,28 +1,58 @@
 """
 Main file
 """
+from argparse import ArgumentParser
+from contextlib import nullcontext
+from datetime import timedelta
 from os import getenv
+from time import perf_counter
 
 from dotenv import load_dotenv
 
-from ade import ADEClient, Category, Classroom, Unite, Instructor, Event
+from ade import ADEClient, Category, Classroom, Unite, Instructor, Event, EventTable, find_conflicts
 from ade.elements import Activity
 from aurion import AurionClient
 from database import Database
+from snapshot import Snapshot
 
 load_dotenv()
 
+parser = ArgumentParser(description="Synchronize the ADE and Aurion data into the database")
+parser.add_argument("--archive", metavar="DIR", default=getenv("SNAPSHOT_DIR") or None,
+                    help="archive the raw API responses in a new snapshot of this directory")
+parser.add_argument("--replay", metavar="SNAPSHOT",
+                    help="read the raw API responses from this snapshot instead of querying the APIs")
+parser.add_argument("--compression", choices=["gzip", "zstd"], default=getenv("SNAPSHOT_COMPRESSION") or "gzip",
+                    help="compression of the archived responses")
+parser.add_argument("--report", action="store_true",
+                    help="print the instructor hours of each department")
+parser.add_argument("--bulk", action="store_true",
+                    help="load the events without their constraints and indexes, and rebuild them afterwards")
+args = parser.parse_args()
+
+snapshot = None
+if args.replay:
+    snapshot = Snapshot(args.replay, replay=True)
+    print("> Replaying snapshot {}".format(snapshot.path), end="\n\n")
+elif args.archive:
+    snapshot = Snapshot.create(args.archive, compression=args.compression)
+    print("> Archiving responses in {}".format(snapshot.path), end="\n\n")
+
+started_at = perf_counter()
+
 ade = ADEClient(
     url=getenv("ADE_URL"),
     login=getenv("ADE_LOGIN"),
-    password=getenv("ADE_PASSWORD")
+    password=getenv("ADE_PASSWORD"),
+    snapshot=snapshot
 )
 
 aurion = AurionClient(
     url=getenv("AURION_URL"),
     login=getenv("AURION_LOGIN"),
     password=getenv("AURION_PASSWORD"),
-    database=getenv("AURION_DATABASE")
+    database=getenv("AURION_DATABASE"),
+    snapshot=snapshot
 )
 
 print("> Connection to ADE...")
@@ -31,7 +61,7 @@ ade.set_project(getenv("ADE_PROJECT_ID"))
 print("> Connected", end="\n\n")
 
 print("> Fetching resources from ADE... (1/3)")
-raw_resources = ade.get_resources()
+raw_resources = ade.get_resources_by_category([Category.CLASSROOM, Category.INSTRUCTOR, Category.UNITE])
 
 print("> Fetching events from ADE... (2/3)")
 raw_events = ade.get_events()
@@ -39,6 +69,10 @@ raw_events = ade.get_events()
 print("> Fetching activities from ADE... (3/3)", end="\n\n")
 raw_activities = ade.get_activities()
 
+for name, size in ade.payload_sizes.items():
+    print("> {}: {:.1f} kB".format(name, size / 1000))
+print("> Total: {:.1f} kB".format(sum(ade.payload_sizes.values()) / 1000), end="\n\n")
+
 print("> Fetching unite data from Aurion... (1/2)", end="\n\n")
 aurion_unites = aurion.get_unites()
 
@@ -46,29 +80,39 @@ print("> Analyzing resources...")
 classrooms = []
 instructors = []
 unites = []
-for resource in raw_resources.iter(tag="resource"):
-    category = resource.get("category")
-
-    if resource.get("isGroup") != "false":
-        continue
-
-    if category == Category.CLASSROOM:
-        classrooms.append(Classroom.from_element(resource))
-    elif category == Category.UNITE:
-        unites.append(Unite.from_element(resource))
-    elif category == Category.INSTRUCTOR:
-        instructors.append(Instructor.from_element(resource))
+for category, element in raw_resources.items():
+    for resource in element.iter(tag="resource"):
+        # the groups should already be left out by ADE, this does not rely on it
+        if resource.get("isGroup") != "false":
+            continue
+
+        if category == Category.CLASSROOM:
+            classrooms.append(Classroom.from_element(resource))
+        elif category == Category.UNITE:
+            unites.append(Unite.from_element(resource))
+        elif category == Category.INSTRUCTOR:
+            instructors.append(Instructor.from_element(resource))
 
 print("> Analyzing events...")
 events = []
 for event in raw_events.iter(tag="event"):
     events.append(Event.from_element(event))
 
-print("> Analyzing activities...", end="\n\n")
+print("> Analyzing activities...")
 activities = []
 for activity in raw_activities:
     activities.append(Activity.from_element(activity))
 
+print("> Detecting conflicts...", end="\n\n")
+conflicts = find_conflicts(events)
+
+if args.report:
+    print("> Instructor hours by department:")
+    hours = EventTable(events, instructors).hours_by_department()
+    for department, total in sorted(hours.items(), key=lambda item: item[1], reverse=True):
+        print(">   {}: {:.1f}h".format(department, total))
+    print()
+
 database = Database(
     host=getenv("POSTGRES_HOST"),
     dbname=getenv("POSTGRES_DBNAME"),
@@ -77,6 +121,9 @@ database = Database(
 )
 
 with database.transaction():
+    print("> Snapshot existing events...")
+    database.snapshot_events()
+
     print("> Clean existing tables...")
     database.clean()
 
@@ -86,13 +133,31 @@ with database.transaction():
     database.populate_instructors(instructors)
     database.populate_unites(unites, aurion_unites)
 
-    # populate events
-    print("> Populate events tables...")
-    database.populate_events(events)
+    # populate events, the constraints and indexes of the events tables are rebuilt at the end in bulk mode
+    with database.bulk_load() if args.bulk else nullcontext():
+        print("> Populate events tables{}...".format(" (bulk mode)" if args.bulk else ""))
+        database.populate_events(events)
+
+        # update events with activities
+        database.populate_activities(activities)
+
+    # populate the double-booked resources
+    print("> Populate conflicts table ({} conflicts)...".format(len(conflicts)))
+    database.populate_conflicts(conflicts)
 
-    # update events with activities
-    database.populate_activities(activities)
+    # compare with the previous events and notify the listeners of the changes
+    print("> Compute events changes...")
+    changes = database.populate_changes()
+    print("> {} events changed".format(changes))
+
+    purged = database.purge_changes(timedelta(days=int(getenv("CHANGES_RETENTION_DAYS") or 30)))
+    print("> {} old events changes purged".format(purged))
+
+    # the listeners, such as the schedule service, are notified once the transaction is committed
+    database.notify_sync()
 
     print("> End")
 
 database.close()
+
+print("> Done in {:.2f}s".format(perf_counter() - started_at))
@@ -0,0 +1,105 @@
+"""
+Refresh the events of a single resource, without synchronizing the whole project
+"""
+from argparse import ArgumentParser
+from os import getenv
+from time import perf_counter
+
+from dotenv import load_dotenv
+
+from ade import ADEClient, Event
+from ade.elements import Activity
+from database import Database
+from database.database import RESOURCE_FILTERS
+
+load_dotenv()
+
+parser = ArgumentParser(description="Refresh the events of a single ADE resource")
+parser.add_argument("resource", choices=list(RESOURCE_FILTERS), help="kind of the resource")
+parser.add_argument("id", type=int, help="ADE id of the resource")
+args = parser.parse_args()
+
+started_at = perf_counter()
+
+ade = ADEClient(
+    url=getenv("ADE_URL"),
+    login=getenv("ADE_LOGIN"),
+    password=getenv("ADE_PASSWORD")
+)
+
+print("> Connection to ADE...")
+ade.connect()
+ade.set_project(getenv("ADE_PROJECT_ID"))
+print("> Connected", end="\n\n")
+
+# the trainee groups are stored by name with the events
+value = args.id
+if args.resource == "trainee":
+    resource = ade.get_resources(detail=2, id=args.id).find("resource")
+    if resource is None:
+        raise ValueError("The trainee group {} does not exist in ADE".format(args.id))
+
+    value = resource.get("name")
+
+print("> Fetching events of {} {} from ADE...".format(args.resource, value))
+events = []
+for event in ade.get_events(resources=args.id).iter(tag="event"):
+    events.append(Event.from_element(event))
+
+database = Database(
+    host=getenv("POSTGRES_HOST"),
+    dbname=getenv("POSTGRES_DBNAME"),
+    user=getenv("POSTGRES_USER"),
+    password=getenv("POSTGRES_PASSWORD")
+)
+
+# everything is fetched from ADE before writing, so that the write transaction does not wait for ADE
+with database.transaction():
+    previous = database.find_event_ids(args.resource, value)
+
+# an event which left the resource may have been moved to another one rather than removed, so it is fetched again
+fetched = {event.id for event in events}
+removed = []
+for event_id in previous:
+    if event_id in fetched:
+        continue
+
+    moved = [Event.from_element(event) for event in ade.get_events(eventId=event_id).iter(tag="event")]
+    if moved:
+        events.extend(moved)
+    else:
+        removed.append(event_id)
+
+ids = [event.id for event in events] + removed
+
+with database.transaction():
+    known = database.find_known_activities(list({event.activity_id for event in events}))
+
+# the activities of the new events are fetched one by one, they are usually already known
+activities = []
+for activity_id in {event.activity_id for event in events} - known:
+    for activity in ade.get_activities(id=activity_id):
+        activities.append(Activity.from_element(activity))
+
+with database.transaction():
+    print("> Refresh {} events ({} removed)...".format(len(ids), len(removed)))
+    database.snapshot_events(ids)
+    database.refresh_events(events, removed)
+
+    if activities:
+        print("> Populate {} new activities...".format(len(activities)))
+        database.populate_activities(activities)
+
+    conflicts = database.refresh_conflicts(events, ids)
+    print("> {} conflicts on the touched resources".format(conflicts))
+
+    changes = database.populate_changes(ids)
+    print("> {} events changed".format(changes))
+
+    database.notify_sync()
+
+    print("> End")
+
+database.close()
+
+print("> Done in {:.2f}s".format(perf_counter() - started_at))
@@ -0,0 +1,30 @@
+"""
+Serve the schedule over HTTP
+"""
+from os import getenv
+
+from dotenv import load_dotenv
+
+from service import LRUCache, ScheduleService
+
+load_dotenv()
+
+cache = LRUCache(
+    max_entries=int(getenv("SERVICE_CACHE_ENTRIES") or 1024),
+    max_bytes=int(getenv("SERVICE_CACHE_BYTES") or 64 * 1024 * 1024)
+)
+
+service = ScheduleService(
+    cache,
+    pool_size=int(getenv("SERVICE_POOL_SIZE") or 4),
+    host=getenv("POSTGRES_HOST"),
+    dbname=getenv("POSTGRES_DBNAME"),
+    user=getenv("POSTGRES_USER"),
+    password=getenv("POSTGRES_PASSWORD")
+)
+
+host = getenv("SERVICE_HOST") or "127.0.0.1"
+port = int(getenv("SERVICE_PORT") or 8000)
+
+print("> Serving the schedule on http://{}:{}".format(host, port))
+service.serve(host, port)
@@ -0,0 +1,6 @@
+"""
+All elements allowing to serve the schedule over HTTP
+"""
+from .cache import LRUCache
+from .pool import DatabasePool
+from .server import ScheduleService
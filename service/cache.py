@@ -0,0 +1,85 @@
+"""
+In-memory cache of the responses of the schedule service.
+"""
+from collections import OrderedDict
+from threading import Lock
+from typing import Hashable, Optional
+
+
+class LRUCache:
+    """
+    Cache evicting the least recently used entries once its size limits are reached.
+
+    The cache has a generation, incremented each time it is cleared. A value computed from the database is only stored
+    if the cache was not cleared in the meantime, otherwise it could be older than the last synchronization.
+    """
+    max_entries: int
+    max_bytes: int
+    generation: int
+
+    def __init__(self, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        """
+        Create a new empty cache
+
+        :param max_entries: maximum number of entries kept in the cache
+        :param max_bytes: maximum total size of the values kept in the cache
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.generation = 0
+
+        self._entries: OrderedDict[Hashable, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[bytes]:
+        """
+        Get a value from the cache, and mark it as the most recently used
+
+        :param key: the key of the value
+        :return: the value, or None if it is not in the cache
+        """
+        with self._lock:
+            value = self._entries.get(key)
+            if value is not None:
+                self._entries.move_to_end(key)
+
+            return value
+
+    def put(self, key: Hashable, value: bytes, generation: int):
+        """
+        Store a value in the cache, evicting the least recently used values if needed
+
+        :param key: the key of the value
+        :param value: the value to be stored
+        :param generation: the generation of the cache when the value started to be computed
+        """
+        if len(value) > self.max_bytes:
+            return
+
+        with self._lock:
+            # the cache has been cleared while the value was computed, so the value may be outdated
+            if generation != self.generation:
+                return
+
+            if key in self._entries:
+                self._size -= len(self._entries.pop(key))
+
+            self._entries[key] = value
+            self._size += len(value)
+
+            while len(self._entries) > self.max_entries or self._size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def clear(self):
+        """
+        Remove all the values from the cache and start a new generation
+        """
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.generation += 1
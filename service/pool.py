@@ -0,0 +1,111 @@
+"""
+Pool of database connections shared by the threads of the schedule service.
+"""
+from contextlib import contextmanager
+from queue import Empty, Queue
+from threading import Lock
+from typing import Iterator
+
+import psycopg
+
+from database import Database
+
+
+class DatabasePool:
+    """
+    Keep a few autocommit connections open, so that concurrent requests do not wait for a single connection.
+
+    The connections are opened on demand, up to ``size``. A connection which raised a database error is closed rather
+    than given back, since it may be broken.
+    """
+    conn: dict
+    size: int
+
+    def __init__(self, size=4, **conn):
+        """
+        Create a new empty pool
+
+        :param size: maximum number of connections open at the same time
+        :param conn: database connection information
+        """
+        self.conn = conn
+        self.size = size
+
+        self._idle: Queue[Database] = Queue()
+        self._opened = 0
+        self._lock = Lock()
+
+    @contextmanager
+    def connection(self, timeout=10.0) -> Iterator[Database]:
+        """
+        Start a context block with a connection of the pool
+
+        :param timeout: how long to wait for a connection when they are all in use, in seconds
+        :raise psycopg.OperationalError: if no connection is available in time
+        """
+        database = self._acquire(timeout)
+
+        try:
+            yield database
+        except psycopg.Error:
+            self._discard(database)
+            raise
+        except BaseException:
+            self._idle.put(database)
+            raise
+        else:
+            self._idle.put(database)
+
+    def close(self):
+        """Close the idle connections of the pool"""
+        while True:
+            try:
+                database = self._idle.get_nowait()
+            except Empty:
+                return
+
+            self._discard(database)
+
+    def _acquire(self, timeout: float) -> Database:
+        """
+        Take an idle connection, or open a new one if the pool is not full
+
+        :param timeout: how long to wait for a connection when they are all in use, in seconds
+        :return: the connection
+        """
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            pass
+
+        with self._lock:
+            opening = self._opened < self.size
+            if opening:
+                self._opened += 1
+
+        if opening:
+            try:
+                return Database(autocommit=True, **self.conn)
+            except BaseException:
+                with self._lock:
+                    self._opened -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=timeout)
+        except Empty:
+            raise psycopg.OperationalError("No database connection available after {}s".format(timeout))
+
+    def _discard(self, database: Database):
+        """
+        Close a connection and make room for a new one
+
+        :param database: the connection to be closed
+        """
+        with self._lock:
+            self._opened -= 1
+
+        try:
+            database.close()
+        except psycopg.Error:
+            pass
@@ -0,0 +1,200 @@
+"""
+Read-only HTTP service exposing the schedule filled by the synchronization.
+
+The events of a trainee group, an instructor, a classroom or an unite are served with:
+
+``GET /events?classroom=<id>&start=<ISO 8601 date>&end=<ISO 8601 date>``
+
+The responses are kept in an in-memory cache, so the hot timetables never reach the database. The cache is cleared
+when the synchronization commits, which is announced on the ``planif_sync`` channel.
+"""
+import json
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from time import sleep
+from typing import Union
+from urllib.parse import parse_qs, urlparse
+
+import arrow
+import psycopg
+
+from database import Database
+from database.database import RESOURCE_FILTERS, SYNC_CHANNEL
+from .cache import LRUCache
+from .pool import DatabasePool
+
+# range of the INTEGER ids of the database
+MIN_ID = -2 ** 31
+MAX_ID = 2 ** 31 - 1
+
+
+def parse_resource(resource: str, value: str) -> Union[int, str]:
+    """
+    Parse the value identifying a resource
+
+    :param resource: the kind of the resource, "trainee", "instructor", "classroom" or "unite"
+    :param value: the id of the resource, or the name of the trainee group
+    :return: the id of the resource, or the name of the trainee group
+    :raise ValueError: if the id is not an integer the database can hold
+    """
+    if resource == "trainee":
+        return value
+
+    try:
+        id = int(value)
+    except ValueError:
+        raise ValueError("The id of the {} must be an integer".format(resource))
+
+    if not MIN_ID <= id <= MAX_ID:
+        raise ValueError("The id of the {} is out of range".format(resource))
+
+    return id
+
+
+class ScheduleService:
+    """Serve the events from the database through a cache"""
+    conn: dict
+    cache: LRUCache
+    pool: DatabasePool
+
+    def __init__(self, cache: LRUCache, pool_size=4, **conn):
+        """
+        Create a new schedule service
+
+        :param cache: the cache of the responses
+        :param pool_size: maximum number of database connections used to answer the requests missing the cache
+        :param conn: database connection information
+        """
+        self.conn = conn
+        self.cache = cache
+        self.pool = DatabasePool(size=pool_size, **conn)
+
+    def serve(self, host: str, port: int):
+        """
+        Listen to the synchronizations and serve the HTTP requests until interrupted
+
+        :param host: the address to listen on
+        :param port: the port to listen on
+        """
+        Thread(target=self._listen, daemon=True).start()
+
+        server = ThreadingHTTPServer((host, port), _Handler)
+        server.service = self
+
+        try:
+            server.serve_forever()
+        finally:
+            server.server_close()
+            self.pool.close()
+
+    def events(self, resource: str, value: str, start: str, end: str) -> bytes:
+        """
+        Get the events of a resource during a time range, from the cache if possible
+
+        :param resource: the kind of the resource, "trainee", "instructor", "classroom" or "unite"
+        :param value: the id of the resource, or the name of the trainee group
+        :param start: the start of the time range, as an ISO 8601 date
+        :param end: the end of the time range, as an ISO 8601 date
+        :return: the JSON list of the events
+        :raise ValueError: if the params are not correct
+        :raise psycopg.Error: if the database cannot be queried
+        """
+        value = parse_resource(resource, value)
+
+        try:
+            start_at = arrow.get(start).to("utc").datetime
+            end_at = arrow.get(end).to("utc").datetime
+        except (ValueError, TypeError):
+            raise ValueError("start and end must be ISO 8601 dates")
+
+        key = (resource, value, start_at, end_at)
+
+        response = self.cache.get(key)
+        if response is not None:
+            return response
+
+        generation = self.cache.generation
+
+        with self.pool.connection() as database:
+            events = database.find_events(resource, value, start_at, end_at)
+        response = json.dumps(events, default=lambda item: item.isoformat()).encode()
+
+        self.cache.put(key, response, generation)
+
+        return response
+
+    def _listen(self):
+        """
+        Clear the cache each time a synchronization is committed
+        """
+        while True:
+            try:
+                database = Database(autocommit=True, **self.conn)
+            except Exception as error:
+                print("> Unable to listen to the synchronizations: {}".format(error))
+                sleep(5)
+                continue
+
+            # the notifications sent while we were not listening are lost, so the cache is cleared on each connection
+            self.cache.clear()
+
+            try:
+                for _ in database.notifications(SYNC_CHANNEL):
+                    self.cache.clear()
+            except Exception as error:
+                print("> Lost the connection listening to the synchronizations: {}".format(error))
+            finally:
+                try:
+                    database.close()
+                except Exception:
+                    pass
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Handle the HTTP requests of the schedule service"""
+    server: ThreadingHTTPServer
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/events":
+            self._respond(HTTPStatus.NOT_FOUND, {"error": "Unknown path {}".format(url.path)})
+            return
+
+        query = {key: values[0] for key, values in parse_qs(url.query).items()}
+
+        resources = [resource for resource in RESOURCE_FILTERS if resource in query]
+        if len(resources) != 1:
+            message = "Exactly one of {} must be given".format(", ".join(RESOURCE_FILTERS))
+            self._respond(HTTPStatus.BAD_REQUEST, {"error": message})
+            return
+
+        resource = resources[0]
+
+        try:
+            body = self.server.service.events(resource, query[resource], query.get("start"), query.get("end"))
+        except ValueError as error:
+            self._respond(HTTPStatus.BAD_REQUEST, {"error": str(error)})
+            return
+        except psycopg.Error as error:
+            self.log_error("Database error: %s", error)
+            self._respond(HTTPStatus.SERVICE_UNAVAILABLE, {"error": "The database is unavailable"})
+            return
+
+        self._respond(HTTPStatus.OK, body)
+
+    def _respond(self, status: HTTPStatus, body):
+        """
+        Send a JSON response
+
+        :param status: the status of the response
+        :param body: the encoded JSON body, or an object to be encoded
+        """
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
@@ -0,0 +1,4 @@
+"""
+All elements allowing to archive and replay the raw API responses
+"""
+from .snapshot import Snapshot
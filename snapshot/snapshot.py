@@ -0,0 +1,135 @@
+"""
+Archive the raw responses of the ADE and Aurion APIs, and read them back.
+
+Each response is stored compressed in its own file, named after the request which produced it. The archive can then be
+replayed: the clients read the responses from the archive instead of querying the APIs, so that a synchronization can
+be reproduced without reaching ADE or Aurion.
+
+Responses are compressed with gzip, or with zstd if the optional ``zstandard`` package is installed.
+"""
+import gzip
+import mmap
+# noinspection PyPep8Naming
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from pathlib import Path
+from typing import Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# file extension of each supported compression
+EXTENSIONS = {
+    "gzip": ".xml.gz",
+    "zstd": ".xml.zst",
+}
+
+# params which are not a part of the name of a response, either because they change on each session or because they
+# are secrets
+IGNORED_PARAMS = {"sessionId", "url", "login", "password"}
+
+
+class Snapshot:
+    """
+    A directory holding the raw responses of a synchronization.
+    """
+    path: Path
+    compression: str
+    replay: bool
+
+    def __init__(self, path: Union[str, Path], replay=False, compression="gzip"):
+        """
+        Open a snapshot directory
+
+        :param path: the directory of the snapshot
+        :param replay: whether the responses are read from the snapshot instead of being archived in it
+        :param compression: compression used to archive the responses, "gzip" or "zstd"
+        :raise ValueError: if the compression is not available
+        """
+        if compression not in EXTENSIONS:
+            raise ValueError("Unknown compression {}, expected one of {}".format(compression, ", ".join(EXTENSIONS)))
+
+        if compression == "zstd" and zstandard is None:
+            raise ValueError("The zstandard package must be installed to use the zstd compression")
+
+        self.path = Path(path)
+        self.replay = replay
+        self.compression = compression
+
+    @classmethod
+    def create(cls, root: Union[str, Path], compression="gzip") -> "Snapshot":
+        """
+        Create a new snapshot directory, named after the current time, to archive the responses in
+
+        :param root: the directory where the snapshots are stored
+        :param compression: compression used to archive the responses, "gzip" or "zstd"
+        :return: the snapshot created
+        """
+        path = Path(root) / datetime.now().strftime("%Y%m%d-%H%M%S")
+        path.mkdir(parents=True, exist_ok=True)
+
+        return cls(path, compression=compression)
+
+    @staticmethod
+    def name(request: Union[str, int], **params) -> str:
+        """
+        Build the name of a response from the request which produced it
+
+        :param request: the function, or the request id, executed by the API
+        :param params: params sent in the query string
+        :return: the name of the response
+        """
+        parts = [str(request)]
+        for key, value in sorted(params.items()):
+            if key in IGNORED_PARAMS or key == "function":
+                continue
+
+            parts.append("{}-{}".format(key, value))
+
+        return ".".join(parts).replace("/", "_")
+
+    def save(self, name: str, content: bytes):
+        """
+        Archive a raw response
+
+        :param name: the name of the response
+        :param content: the raw content of the response
+        """
+        file = self.path / (name + EXTENSIONS[self.compression])
+
+        if self.compression == "zstd":
+            file.write_bytes(zstandard.ZstdCompressor().compress(content))
+        else:
+            file.write_bytes(gzip.compress(content))
+
+    def load(self, name: str) -> ET.Element:
+        """
+        Read an archived response and parse it
+
+        The file is memory-mapped and decompressed as a stream while being parsed, the decompressed response is never
+        held in memory as a whole.
+
+        :param name: the name of the response
+        :return: the XML element of the response
+        :raise FileNotFoundError: if the response is not in the snapshot
+        """
+        for compression, extension in EXTENSIONS.items():
+            file = self.path / (name + extension)
+            if file.exists():
+                break
+        else:
+            raise FileNotFoundError("The response {} is not in the snapshot {}".format(name, self.path))
+
+        with open(file, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if compression == "zstd":
+                if zstandard is None:
+                    raise ValueError("The zstandard package must be installed to read {}".format(file))
+
+                stream = zstandard.ZstdDecompressor().stream_reader(mapped)
+            else:
+                stream = gzip.GzipFile(fileobj=mapped)
+
+            with stream:
+                return ET.parse(stream).getroot()
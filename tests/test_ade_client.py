@@ -1,3 +1,70 @@
 """
 Test the interaction of the ADEClient with the ADE API
 """
+import logging
+
+import pytest
+
+from ade import ADEClient, Category
+from ade.adeclient import FULL_DETAIL, RESOURCES_DETAIL
+from snapshot import Snapshot
+
+# responses of getResources for each category, shaped like the ones documented in the ``from_element`` constructors
+RESPONSES = {
+    Category.CLASSROOM: b'<resources><resource id="1" name="5407V" category="classroom" isGroup="false" '
+                        b'fatherName="08-Labos" /></resources>',
+    Category.INSTRUCTOR: b'<resources><resource id="360" name="MAIRESSE Je." category="instructor" isGroup="false" '
+                         b'path="ESIEE PARIS 2020-2021._Administratifs." fatherName="_Administratifs" code="Jean" />'
+                         b'</resources>',
+    Category.UNITE: b'<resources><resource id="42" name="IGI-1104" category="category6" isGroup="false" '
+                    b'fatherName="E1" code="E1_IGI_1104" /></resources>',
+}
+
+INCOMPLETE_CLASSROOMS = b'<resources><resource id="1" name="5407V" isGroup="false" /></resources>'
+
+
+def save_resources(snapshot: Snapshot, category: Category, detail: int, content: bytes):
+    name = Snapshot.name("getResources", detail=detail, category=category.value, leaves="true")
+    snapshot.save(name, content)
+
+
+def replay_client(tmp_path) -> ADEClient:
+    return ADEClient(url=None, login="me", snapshot=Snapshot(tmp_path, replay=True))
+
+
+def test_resources_are_fetched_per_category_at_the_chosen_detail(tmp_path):
+    for category, content in RESPONSES.items():
+        save_resources(Snapshot(tmp_path), category, RESOURCES_DETAIL[category], content)
+
+    resources = replay_client(tmp_path).get_resources_by_category(list(RESPONSES))
+
+    assert set(resources) == set(RESPONSES)
+    assert resources[Category.INSTRUCTOR].find("resource").get("code") == "Jean"
+
+
+def test_missing_attribute_falls_back_to_full_detail(tmp_path, caplog):
+    save_resources(Snapshot(tmp_path), Category.CLASSROOM, RESOURCES_DETAIL[Category.CLASSROOM], INCOMPLETE_CLASSROOMS)
+    save_resources(Snapshot(tmp_path), Category.CLASSROOM, FULL_DETAIL, RESPONSES[Category.CLASSROOM])
+
+    with caplog.at_level(logging.WARNING):
+        resources = replay_client(tmp_path).get_resources_by_category([Category.CLASSROOM])
+
+    assert resources[Category.CLASSROOM].find("resource").get("fatherName") == "08-Labos"
+    assert "fatherName" in caplog.text
+
+
+def test_missing_attribute_at_full_detail_fails(tmp_path):
+    save_resources(Snapshot(tmp_path), Category.CLASSROOM, RESOURCES_DETAIL[Category.CLASSROOM], INCOMPLETE_CLASSROOMS)
+    save_resources(Snapshot(tmp_path), Category.CLASSROOM, FULL_DETAIL, INCOMPLETE_CLASSROOMS)
+
+    with pytest.raises(ValueError, match="fatherName"):
+        replay_client(tmp_path).get_resources_by_category([Category.CLASSROOM])
+
+
+def test_missing_group_flag_is_detected(tmp_path):
+    no_flag = b'<resources><resource id="1" name="5407V" fatherName="08-Labos" /></resources>'
+    save_resources(Snapshot(tmp_path), Category.CLASSROOM, RESOURCES_DETAIL[Category.CLASSROOM], no_flag)
+    save_resources(Snapshot(tmp_path), Category.CLASSROOM, FULL_DETAIL, no_flag)
+
+    with pytest.raises(ValueError, match="isGroup"):
+        replay_client(tmp_path).get_resources_by_category([Category.CLASSROOM])
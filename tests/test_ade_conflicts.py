@@ -0,0 +1,73 @@
+"""
+Test the detection of the double-booked resources.
+"""
+from collections import namedtuple
+from datetime import datetime, timezone
+
+from ade import Category, Classroom, Event, Instructor, find_conflicts, resource_conflicts
+
+
+def event(id, start, end, classrooms=(), instructors=(), trainees=()):
+    return Event(
+        id=id,
+        activity_id=0,
+        name="EVENT-{}".format(id),
+        start_at=datetime(2021, 3, 2, start, tzinfo=timezone.utc),
+        end_at=datetime(2021, 3, 2, end, tzinfo=timezone.utc),
+        classrooms=list(classrooms),
+        instructors=list(instructors),
+        trainees=list(trainees)
+    )
+
+
+def test_overlapping_events_conflict():
+    room = Classroom(id=1, name="5407V")
+    conflicts = find_conflicts([event(1, 8, 10, classrooms=[room]), event(2, 9, 11, classrooms=[room])])
+
+    assert len(conflicts) == 1
+    conflict = conflicts[0]
+    assert (conflict.category, conflict.resource) == (Category.CLASSROOM, 1)
+    assert (conflict.event_id, conflict.other_event_id) == (1, 2)
+    assert conflict.start_at.hour == 9
+    assert conflict.end_at.hour == 10
+
+
+def test_back_to_back_events_do_not_conflict():
+    room = Classroom(id=1, name="5407V")
+
+    assert find_conflicts([event(1, 8, 10, classrooms=[room]), event(2, 10, 12, classrooms=[room])]) == []
+
+
+def test_duplicate_resources_are_deduplicated():
+    room = Classroom(id=1, name="5407V")
+
+    # ADE may list the same classroom twice in an event, which must not make the event conflict with itself
+    assert find_conflicts([event(1, 8, 10, classrooms=[room, room])]) == []
+    assert len(find_conflicts([event(1, 8, 10, classrooms=[room, room]), event(2, 9, 10, classrooms=[room])])) == 1
+
+
+def test_every_overlapping_pair_is_reported():
+    teacher = Instructor(id=7, name="Jean MAIRESSE")
+    events = [event(1, 8, 12, instructors=[teacher]), event(2, 9, 10, instructors=[teacher]),
+              event(3, 10, 11, instructors=[teacher]), event(4, 13, 14, instructors=[teacher])]
+
+    pairs = {(conflict.event_id, conflict.other_event_id) for conflict in find_conflicts(events)}
+
+    assert pairs == {(1, 2), (1, 3)}
+
+
+def test_trainee_groups_conflict_by_name():
+    conflicts = find_conflicts([event(1, 8, 10, trainees=["E1-G1"]), event(2, 9, 11, trainees=["E1-G1"]),
+                                event(3, 9, 11, trainees=["E1-G2"])])
+
+    assert [(conflict.category, conflict.resource) for conflict in conflicts] == [(Category.TRAINEE, "E1-G1")]
+
+
+def test_conflicts_of_a_single_resource_from_rows():
+    Booking = namedtuple("Booking", ["id", "start_at", "end_at"])
+    rows = [Booking(id, event(id, start, end).start_at, event(id, start, end).end_at)
+            for id, start, end in [(1, 8, 10), (2, 9, 11), (3, 11, 12)]]
+
+    conflicts = resource_conflicts(Category.CLASSROOM, "1", rows)
+
+    assert [(conflict.resource, conflict.event_id, conflict.other_event_id) for conflict in conflicts] == [("1", 1, 2)]
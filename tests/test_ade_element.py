@@ -1,3 +1,28 @@
 """
 Test populating ADE Resource element from XML data.
 """
+# noinspection PyPep8Naming
+import xml.etree.ElementTree as ET
+
+from ade import Classroom, Instructor, Unite
+
+
+def test_classroom_from_element():
+    element = ET.fromstring('<resource id="1" name="5407V" category="classroom" isGroup="false" '
+                            'fatherName="08-Labos" />')
+
+    assert Classroom.from_element(element) == Classroom(id=1, name="5407V", category="Labos")
+
+
+def test_instructor_from_element():
+    element = ET.fromstring('<resource id="360" name="MAIRESSE Je." category="instructor" isGroup="false" '
+                            'path="ESIEE PARIS 2020-2021._Administratifs." fatherName="_Administratifs" code="Jean" />')
+
+    assert Instructor.from_element(element) == Instructor(id=360, name="Jean MAIRESSE", department="Administratifs")
+
+
+def test_unite_from_element():
+    element = ET.fromstring('<resource id="42" name="IGI-1104" category="category6" isGroup="false" '
+                            'fatherName="E1" code="E1_IGI_1104" />')
+
+    assert Unite.from_element(element) == Unite(id=42, name="IGI-1104", code="E1_IGI_1104", branch="E1")
@@ -0,0 +1,98 @@
+"""
+Test the columnar storage of the events.
+"""
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from ade import Classroom, Event, EventTable, Instructor, Unite
+
+ROOM = Classroom(id=1, name="5407V")
+OTHER_ROOM = Classroom(id=2, name="5201")
+TEACHER = Instructor(id=7, name="Jean MAIRESSE", department="Informatique")
+OTHER_TEACHER = Instructor(id=8, name="Marie CURIE", department="Physique")
+UNITE = Unite(id=42, name="IGI-1104", code="E1_IGI_1104", branch="E1")
+
+
+def at(hour):
+    return datetime(2021, 3, 2, hour, tzinfo=timezone.utc)
+
+
+def table(**kwargs) -> EventTable:
+    events = [
+        Event(id=1, activity_id=10, name="A", start_at=at(8), end_at=at(10), unite=UNITE,
+              classrooms=[ROOM, ROOM], instructors=[TEACHER], trainees=["E1-G1"]),
+        Event(id=2, activity_id=11, name="B", start_at=at(10), end_at=at(11),
+              classrooms=[OTHER_ROOM], instructors=[TEACHER, OTHER_TEACHER], trainees=["E1-G2"]),
+        Event(id=3, activity_id=12, name="C", start_at=at(13), end_at=at(16), unite=UNITE,
+              classrooms=[ROOM], trainees=["E1-G1", "E1-G2"]),
+    ]
+
+    return EventTable(events, **kwargs)
+
+
+def test_relations_are_stored_as_offsets():
+    events = table()
+
+    assert len(events) == 3
+    assert events.classroom_offsets.tolist() == [0, 1, 2, 3]
+    assert events.classroom_ids.tolist() == [1, 2, 1]
+    assert events.instructor_offsets.tolist() == [0, 1, 3, 3]
+    assert events.unite_ids.tolist() == [42, -1, 42]
+
+
+def test_filters():
+    events = table()
+
+    assert events.with_classroom(1).tolist() == [True, False, True]
+    assert events.with_instructor(8).tolist() == [False, True, False]
+    assert events.with_trainee("E1-G2").tolist() == [False, True, True]
+    assert events.with_trainee("unknown").tolist() == [False, False, False]
+    assert events.with_unite(42).tolist() == [True, False, True]
+    assert events.between(at(9), at(12)).tolist() == [True, True, False]
+
+
+def test_back_to_back_events_are_not_between():
+    assert not table().between(at(11), at(13)).any()
+
+
+def test_hours():
+    events = table()
+
+    assert events.hours_by_classroom() == {1: 5.0, 2: 1.0}
+    assert events.hours_by_instructor() == {7: 3.0, 8: 1.0}
+    assert events.hours_by_unite() == {42: 5.0}
+    assert events.hours_by_classroom(events.with_trainee("E1-G1") & events.between(at(8), at(12))) == {1: 2.0}
+
+
+def test_hours_by_department():
+    assert table().hours_by_department() == {"Informatique": 3.0, "Physique": 1.0}
+
+    # the given instructors take precedence over the ones of the events
+    events = table(instructors=[Instructor(id=8, name="Marie CURIE", department="Chimie")])
+    assert events.hours_by_department() == {"Informatique": 3.0, "Chimie": 1.0}
+
+
+def test_occupancy_is_clipped_to_the_range():
+    occupancy = table().occupancy_by_classroom(at(8), at(14))
+
+    assert occupancy[1] == (2 + 1) / 6
+    assert occupancy[2] == 1 / 6
+
+
+def test_empty_table():
+    events = EventTable([])
+
+    assert len(events) == 0
+    assert events.hours_by_classroom() == {}
+    assert events.hours_by_department() == {}
+    assert events.between(at(8), at(9)).dtype == np.bool_
+
+
+def test_occupancy_of_an_empty_range_is_refused():
+    with pytest.raises(ValueError):
+        table().occupancy_by_classroom(at(10), at(10))
+
+    with pytest.raises(ValueError):
+        table().occupancy_by_classroom(at(12), at(8))
@@ -0,0 +1,112 @@
+"""
+Test the order in which the constraints and indexes are rebuilt by a bulk load.
+"""
+from contextlib import contextmanager
+
+import psycopg
+import pytest
+
+from database import Database
+
+CONSTRAINTS = {
+    "events": [("events_pkey", "p", "PRIMARY KEY (id)"),
+               ("events_unite_id_fkey", "f", "FOREIGN KEY (unite_id) REFERENCES unites(id)")],
+    "events_classrooms": [("events_classrooms_event_id_fkey", "f", "FOREIGN KEY (event_id) REFERENCES events(id)"),
+                          ("events_classrooms_pkey", "p", "PRIMARY KEY (event_id, classroom_id)")],
+    "events_instructors": [],
+}
+
+INDEXES = {
+    "events": [("events_start_at_idx", "CREATE INDEX events_start_at_idx ON public.events USING btree (start_at)")],
+    "events_classrooms": [],
+    "events_instructors": [],
+}
+
+
+class StubCursor:
+    """Record the queries and answer the ones reading the catalogs"""
+
+    def __init__(self, orphans=(), failing=None):
+        self.queries = []
+        self.orphans = list(orphans)
+        self.failing = failing
+        self.rows = []
+
+    def execute(self, query, params=None):
+        query = query if isinstance(query, str) else query.as_string(None)
+        query = " ".join(query.split())
+
+        if "FROM pg_constraint" in query and "pg_index" not in query:
+            self.rows = CONSTRAINTS[params[0]]
+            return
+        if "FROM pg_index" in query:
+            self.rows = INDEXES[params[0]]
+            return
+
+        self.queries.append(query)
+        if query.startswith("SELECT DISTINCT"):
+            self.rows, self.orphans = self.orphans[:1], self.orphans[1:]
+        if self.failing and self.failing in query:
+            raise psycopg.errors.ForeignKeyViolation()
+
+    def fetchall(self):
+        return self.rows
+
+
+class StubConnection:
+    def __init__(self, cursor: StubCursor):
+        self.cursor = cursor
+
+    @contextmanager
+    def transaction(self):
+        self.cursor.queries.append("SAVEPOINT")
+        yield
+        self.cursor.queries.append("RELEASE")
+
+
+def database(cursor: StubCursor) -> Database:
+    instance = object.__new__(Database)
+    instance.cursor = cursor
+    instance.connection = StubConnection(cursor)
+    return instance
+
+
+def test_constraints_are_dropped_and_rebuilt_in_order():
+    cursor = StubCursor()
+
+    with database(cursor).bulk_load():
+        cursor.queries.append("LOAD")
+
+    assert cursor.queries == [
+        'ALTER TABLE "events" DROP CONSTRAINT "events_unite_id_fkey"',
+        'ALTER TABLE "events_classrooms" DROP CONSTRAINT "events_classrooms_event_id_fkey"',
+        'ALTER TABLE "events" DROP CONSTRAINT "events_pkey"',
+        'ALTER TABLE "events_classrooms" DROP CONSTRAINT "events_classrooms_pkey"',
+        'DROP INDEX "events_start_at_idx"',
+        "LOAD",
+        'ALTER TABLE "events" ADD CONSTRAINT "events_pkey" PRIMARY KEY (id)',
+        'ALTER TABLE "events_classrooms" ADD CONSTRAINT "events_classrooms_pkey" PRIMARY KEY (event_id, classroom_id)',
+        "SAVEPOINT",
+        'ALTER TABLE "events" ADD CONSTRAINT "events_unite_id_fkey" FOREIGN KEY (unite_id) REFERENCES unites(id)',
+        "RELEASE",
+        "SAVEPOINT",
+        'ALTER TABLE "events_classrooms" ADD CONSTRAINT "events_classrooms_event_id_fkey" '
+        'FOREIGN KEY (event_id) REFERENCES events(id)',
+        "RELEASE",
+        "CREATE INDEX events_start_at_idx ON public.events USING btree (start_at)",
+    ]
+
+
+def test_orphans_are_only_searched_when_a_foreign_key_fails():
+    cursor = StubCursor(orphans=[(7,), (12,)], failing="events_classrooms_event_id_fkey\" FOREIGN KEY")
+
+    with pytest.raises(ValueError, match=r"2 orphan references from ADE: events\.unite_id = 7, "
+                                         r"events_classrooms\.event_id = 12"):
+        with database(cursor).bulk_load():
+            pass
+
+    # the orphans are searched once, after the failing foreign key, and no index is rebuilt after the failure
+    searches = [i for i, query in enumerate(cursor.queries) if query.startswith("SELECT DISTINCT")]
+    failure = next(i for i, query in enumerate(cursor.queries) if cursor.failing in query)
+    assert len(searches) == 5 and searches[0] == failure + 1
+    assert not any(query.startswith("CREATE INDEX") for query in cursor.queries)
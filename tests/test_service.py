@@ -0,0 +1,175 @@
+"""
+Test the cache and the requests handling of the schedule service.
+"""
+import json
+import threading
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from http.server import ThreadingHTTPServer
+
+import psycopg
+import pytest
+
+from service import DatabasePool, LRUCache, ScheduleService
+from service.server import _Handler, parse_resource
+
+
+def test_cache_evicts_the_least_recently_used_entry():
+    cache = LRUCache(max_entries=2)
+    cache.put("a", b"1", cache.generation)
+    cache.put("b", b"2", cache.generation)
+
+    cache.get("a")
+    cache.put("c", b"3", cache.generation)
+
+    assert cache.get("a") == b"1"
+    assert cache.get("b") is None
+    assert cache.get("c") == b"3"
+
+
+def test_cache_respects_the_size_limit():
+    cache = LRUCache(max_bytes=5)
+    cache.put("a", b"123", cache.generation)
+    cache.put("b", b"456", cache.generation)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == b"456"
+
+    # a value bigger than the whole cache is never stored
+    cache.put("c", b"123456", cache.generation)
+    assert cache.get("c") is None
+
+
+def test_cache_drops_values_computed_before_a_clear():
+    cache = LRUCache()
+    generation = cache.generation
+
+    cache.clear()
+    cache.put("a", b"1", generation)
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_parse_resource():
+    assert parse_resource("classroom", "42") == 42
+    assert parse_resource("trainee", "E1-G1") == "E1-G1"
+
+    for value in ["x", "²", "99999999999", "-99999999999"]:
+        with pytest.raises(ValueError):
+            parse_resource("classroom", value)
+
+
+class FakePool:
+    """Pool answering every query with the same events, or failing"""
+
+    def __init__(self, error=None):
+        self.error = error
+        self.queries = 0
+
+    @contextmanager
+    def connection(self):
+        self.queries += 1
+        if self.error:
+            raise self.error
+
+        yield self
+
+    def find_events(self, resource, value, start_at, end_at):
+        return [{"id": 1, "start_at": start_at}]
+
+
+@pytest.fixture
+def serve():
+    servers = []
+
+    def serve(pool) -> str:
+        service = object.__new__(ScheduleService)
+        service.cache = LRUCache()
+        service.pool = pool
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        server.service = service
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+
+        return "http://127.0.0.1:{}".format(server.server_port)
+
+    yield serve
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def get(url):
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as error:
+        return error.code, json.loads(error.read())
+
+
+def test_events_are_cached(serve):
+    pool = FakePool()
+    url = serve(pool) + "/events?classroom=3&start=2021-03-01&end=2021-03-08"
+
+    assert get(url) == (200, [{"id": 1, "start_at": "2021-03-01T00:00:00+00:00"}])
+    assert get(url)[0] == 200
+    assert pool.queries == 1
+
+
+def test_bad_requests(serve):
+    base = serve(FakePool())
+
+    assert get(base + "/unknown")[0] == 404
+    assert get(base + "/events?start=2021-03-01&end=2021-03-08")[0] == 400
+    assert get(base + "/events?classroom=99999999999&start=2021-03-01&end=2021-03-08")[0] == 400
+    assert get(base + "/events?trainee=E1-G1&start=yesterday")[0] == 400
+
+
+def test_database_errors_are_unavailable(serve):
+    base = serve(FakePool(error=psycopg.OperationalError("connection lost")))
+
+    assert get(base + "/events?classroom=3&start=2021-03-01&end=2021-03-08")[0] == 503
+
+
+class FakeDatabase:
+    """Connection which does not reach any database"""
+
+    def __init__(self, **conn):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_pool_reuses_and_limits_connections(monkeypatch):
+    monkeypatch.setattr("service.pool.Database", FakeDatabase)
+    pool = DatabasePool(size=2)
+
+    with pool.connection() as first, pool.connection() as second:
+        assert first is not second
+
+        # the pool is full, so the third request waits and fails
+        with pytest.raises(psycopg.OperationalError):
+            with pool.connection(timeout=0.01):
+                pass
+
+    with pool.connection() as reused:
+        assert reused in (first, second)
+
+
+def test_pool_discards_broken_connections(monkeypatch):
+    monkeypatch.setattr("service.pool.Database", FakeDatabase)
+    pool = DatabasePool(size=1)
+
+    with pytest.raises(psycopg.OperationalError):
+        with pool.connection() as broken:
+            raise psycopg.OperationalError("connection lost")
+
+    assert broken.closed
+
+    with pool.connection() as database:
+        assert database is not broken
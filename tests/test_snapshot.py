@@ -0,0 +1,65 @@
+"""
+Test archiving and replaying the raw API responses.
+"""
+import gzip
+
+import pytest
+
+from ade import ADEClient
+from snapshot import Snapshot
+from snapshot.snapshot import zstandard
+
+EVENTS = b'<events><event id="1" activityId="2" name="FLE-2:TD" date="02/03/2021" startHour="17:00" ' \
+         b'endHour="19:00" /></events>'
+
+
+def test_name_leaves_out_secrets_and_session():
+    name = Snapshot.name("getEvents", detail=8, function="getEvents", sessionId="abc", login="me", password="secret")
+
+    assert name == "getEvents.detail-8"
+
+
+def test_name_is_independent_of_params_order():
+    assert Snapshot.name("getResources", detail=3, category="classroom") == \
+           Snapshot.name("getResources", category="classroom", detail=3)
+
+
+def test_gzip_round_trip(tmp_path):
+    snapshot = Snapshot(tmp_path)
+    snapshot.save("getEvents.detail-8", EVENTS)
+
+    assert gzip.decompress((tmp_path / "getEvents.detail-8.xml.gz").read_bytes()) == EVENTS
+    assert snapshot.load("getEvents.detail-8").find("event").get("name") == "FLE-2:TD"
+
+
+@pytest.mark.skipif(zstandard is None, reason="zstandard is not installed")
+def test_zstd_round_trip(tmp_path):
+    snapshot = Snapshot(tmp_path, compression="zstd")
+    snapshot.save("getEvents.detail-8", EVENTS)
+
+    assert Snapshot(tmp_path, replay=True).load("getEvents.detail-8").find("event").get("id") == "1"
+
+
+def test_unknown_compression_is_refused(tmp_path):
+    with pytest.raises(ValueError):
+        Snapshot(tmp_path, compression="bzip2")
+
+
+def test_missing_response_is_reported(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        Snapshot(tmp_path, replay=True).load("getEvents.detail-8")
+
+
+def test_create_makes_a_new_directory(tmp_path):
+    snapshot = Snapshot.create(tmp_path)
+
+    assert snapshot.path.is_dir()
+    assert snapshot.path.parent == tmp_path
+
+
+def test_client_replays_without_url(tmp_path):
+    Snapshot(tmp_path).save(Snapshot.name("getEvents", detail=8), EVENTS)
+
+    ade = ADEClient(url=None, login="me", snapshot=Snapshot(tmp_path, replay=True))
+
+    assert ade.get_events().find("event").get("id") == "1"